@@ -1,9 +1,13 @@
+import glob
+import json
 import os
 import pathlib
 import re
-from collections import Counter, defaultdict
-from itertools import product
-from typing import Iterable
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Iterable, NamedTuple
 
 import numpy as np
 import xarray as xr
@@ -11,20 +15,44 @@ from xarray.backends import AbstractDataStore, BackendArray, BackendEntrypoint
 from xarray.backends.file_manager import CachingFileManager
 from xarray.backends.locks import ensure_lock
 from xarray.core import indexing
-from xarray.core.utils import close_on_error, try_read_magic_number_from_path
+from xarray.core.utils import close_on_error
 from xarray.core.variable import Variable
 
 import sdf_xarray.plotting  # noqa: F401
 
 from .sdf_interface import Constant, SDFFile
 
+# Had some problems with these variables, so just ignore them for now
+_SKIP_VARIABLE = re.compile(r"cpu|output file", re.IGNORECASE).search
+_SKIP_GRID = re.compile("cpu", re.IGNORECASE).search
 
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def _natural_sort_key(path: str) -> list[str | int]:
+    """Sort key that orders numbered files numerically, so that
+    ``10000.sdf`` comes after ``9999.sdf``"""
+    # Splitting on a capturing group puts the matched digits at the odd indices
+    return [
+        int(part) if i % 2 else part for i, part in enumerate(_DIGITS_RE.split(path))
+    ]
+
+
+_UNDERSCORE_TABLE = str.maketrans({"/": "_", " ": "_", "-": "_"})
+
+
+@lru_cache(maxsize=4096)
 def _rename_with_underscore(name: str) -> str:
     """A lot of the variable names have spaces, forward slashes and dashes in them, which
     are not valid in netCDF names so we replace them with underscores."""
-    return name.replace("/", "_").replace(" ", "_").replace("-", "_")
+    return name.translate(_UNDERSCORE_TABLE)
 
 
+# Match affix with preceding space and trailing space or end of string
+_LATEX_AFFIX = re.compile(r"\b([EBJP])([xyz])\b")
+
+
+@lru_cache(maxsize=4096)
 def _process_latex_name(variable_name: str) -> str:
     """Converts variable names to LaTeX format where possible
     using the following rules:
@@ -37,19 +65,83 @@ def _process_latex_name(variable_name: str) -> str:
     or if there is no trailing space. This is to avoid changing variable
     names that may contain these affixes as part of the variable name itself.
     """
-    prefixes = ["E", "B", "J", "P"]
-    suffixes = ["x", "y", "z"]
-    for prefix, suffix in product(prefixes, suffixes):
-        # Match affix with preceding space and trailing space or end of string
-        affix_pattern = rf"\b{prefix}{suffix}\b"
-        # Insert LaTeX format while preserving spaces
-        replacement = rf"${prefix}_{suffix}$"
-        variable_name = re.sub(affix_pattern, replacement, variable_name)
-    return variable_name
+    # Insert LaTeX format while preserving spaces
+    return _LATEX_AFFIX.sub(r"$\1_\2$", variable_name)
+
+
+@lru_cache(maxsize=4096)
+def _split_grid(name: str) -> tuple[str, str]:
+    """Split a grid name into its base name and species name
+
+    There may be multiple grids all with the same coordinate names, so
+    drop the "Grid/" from the start, and append the rest to the
+    dimension name. This lets us disambiguate them all. Probably.
+    The species is the last component of the name.
+    """
+    head, sep, tail = name.partition("/")
+    return (tail if sep else head), name.rpartition("/")[2]
+
+
+def open_sdf(
+    filename: str | os.PathLike,
+    *,
+    drop_variables=None,
+    keep_particles: bool = False,
+) -> xr.Dataset:
+    """Open a single SDF file as an `xarray.Dataset`
+
+    This is equivalent to ``xarray.open_dataset(filename)``, but skips
+    xarray's backend discovery and dispatch, which is noticeable when
+    opening many files or in short-lived scripts.
+
+    Parameters
+    ----------
+    filename :
+        Path to the SDF file
+    drop_variables :
+        Variables to exclude from the dataset
+    keep_particles :
+        If ``True``, also load particle data (this may use a lot of memory!)
+    """
+    return xr.open_dataset(
+        filename,
+        engine=SDFEntrypoint,
+        drop_variables=drop_variables,
+        keep_particles=keep_particles,
+    )
+
 
+def _open_sdf_with_scan(
+    filename: str, *, keep_particles: bool = False
+) -> tuple[xr.Dataset, "_FileScan"]:
+    """Open a single SDF file as for `open_sdf`, along with its time and
+    the names of all the variables and grids in it, read from the same
+    file handle"""
+    store = SDFDataStore.open(filename, keep_particles=keep_particles)
+    with close_on_error(store):
+        scan = store.scan()
+        return xr.open_dataset(store, engine=SDFEntrypoint), scan
+
+
+def combine_datasets(
+    path_glob: Iterable | str, chunks=None, parallel: bool = False, **kwargs
+) -> xr.Dataset:
+    """Combine all datasets using a single time dimension
 
-def combine_datasets(path_glob: Iterable | str, **kwargs) -> xr.Dataset:
-    """Combine all datasets using a single time dimension"""
+    Parameters
+    ----------
+    path_glob :
+        List of filenames or string glob pattern
+    chunks :
+        Chunk sizes for the dask arrays of each file, as for
+        `xarray.open_mfdataset`. ``chunks={}`` gives one chunk per variable
+        per file, which keeps everything lazy
+    parallel :
+        If ``True``, open the files in parallel using ``dask.delayed``. This
+        requires dask to be installed
+    **kwargs :
+        Passed on to `xarray.open_mfdataset`
+    """
 
     return xr.open_mfdataset(
         path_glob,
@@ -57,6 +149,8 @@ def combine_datasets(path_glob: Iterable | str, **kwargs) -> xr.Dataset:
         coords="minimal",
         compat="override",
         preprocess=SDFPreprocess(),
+        chunks=chunks,
+        parallel=parallel,
         **kwargs,
     )
 
@@ -66,6 +160,9 @@ def open_mfdataset(
     *,
     separate_times: bool = False,
     keep_particles: bool = False,
+    chunks=None,
+    parallel: bool = False,
+    max_workers: int | None = None,
 ) -> xr.Dataset:
     """Open a set of EPOCH SDF files as one `xarray.Dataset`
 
@@ -95,76 +192,333 @@ def open_mfdataset(
         different output frequencies
     keep_particles :
         If ``True``, also load particle data (this may use a lot of memory!)
+    chunks :
+        Chunk sizes for the dask arrays of each file, as for
+        `xarray.open_mfdataset`. ``chunks={}`` gives one chunk per variable
+        per file, which keeps everything lazy
+    parallel :
+        If ``True``, open the files in parallel using ``dask.delayed``. This
+        requires dask to be installed
+    max_workers :
+        Maximum number of threads used to open the files with
+        ``separate_times`` when not using ``parallel``. Defaults to one per
+        file, up to 32. Small numbers of files are always opened serially
     """
 
     # TODO: This is not very robust, look at how xarray.open_mfdataset does it
-    if isinstance(path_glob, str):
-        path_glob = pathlib.Path().glob(path_glob)
+    if isinstance(path_glob, (str, os.PathLike)):
+        path_glob = glob.iglob(os.fspath(path_glob), recursive=True)
 
-    # Coerce to list because we might need to use the sequence multiple times
-    path_glob = sorted(list(path_glob))
+    # Coerce to list because we might need to use the sequence multiple
+    # times. Plain strings are much cheaper to sort than `Path` objects
+    path_glob = sorted(map(os.fspath, path_glob), key=_natural_sort_key)
 
     if not separate_times:
-        return combine_datasets(path_glob, keep_particles=keep_particles)
-
-    time_dims, var_times_map = make_time_dims(path_glob)
-    all_dfs = [xr.open_dataset(f, keep_particles=keep_particles) for f in path_glob]
+        return combine_datasets(
+            path_glob, chunks=chunks, parallel=parallel, keep_particles=keep_particles
+        )
 
-    for df in all_dfs:
-        for da in df:
-            df[da] = df[da].expand_dims(
-                dim={var_times_map[str(da)]: [df.attrs["time"]]}
+    # Read what we need to work out the time dimensions while opening each
+    # file, rather than opening every file twice. This includes every
+    # variable in the file, not just the ones we load, so that the names
+    # don't depend on `keep_particles`
+    if parallel:
+        import dask
+
+        open_ = dask.delayed(_open_sdf_with_scan)
+        opened = [open_(f, keep_particles=keep_particles) for f in path_glob]
+        (opened,) = dask.compute(opened)
+    else:
+        opened = _thread_map(
+            partial(_open_sdf_with_scan, keep_particles=keep_particles),
+            path_glob,
+            max_workers=max_workers,
+        )
+    all_dfs = [df for df, _ in opened]
+    scans = [scan for _, scan in opened]
+    _, var_times_map = _group_time_dims(scans)
+    if chunks is not None:
+        all_dfs = [df.chunk(chunks) for df in all_dfs]
+
+    for i, (df, (time, _)) in enumerate(zip(all_dfs, scans)):
+
+        # Expand all the variables sharing a time dimension at once, rather
+        # than reassigning them into the dataset one at a time
+        vars_by_time = defaultdict(list)
+        for da in df.data_vars:
+            vars_by_time[var_times_map[str(da)]].append(da)
+        expanded = {}
+        for time_name, names in vars_by_time.items():
+            expanded.update(df[names].expand_dims(dim={time_name: [time]}).data_vars)
+        df = df.assign(expanded)
+
+        # Likewise for the particle coordinates. We need to undo our renaming
+        # of the coordinates to find their time dimension
+        point_coords = {
+            coord: value.expand_dims(
+                dim={var_times_map[f"Grid_{coord.partition('_')[2]}"]: [time]}
             )
-        for coord in df.coords:
-            if df.coords[coord].attrs.get("point_data", False):
-                # We need to undo our renaming of the coordinates
-                base_name = coord.split("_", maxsplit=1)[-1]
-                sdf_coord_name = f"Grid_{base_name}"
-                df.coords[coord] = df.coords[coord].expand_dims(
-                    dim={var_times_map[sdf_coord_name]: [df.attrs["time"]]}
-                )
+            for coord, value in df.coords.items()
+            if value.attrs.get("point_data", False)
+        }
+        if point_coords:
+            df = df.assign_coords(point_coords)
+
+        all_dfs[i] = df
 
     return xr.combine_by_coords(
         all_dfs, data_vars="minimal", combine_attrs="drop_conflicts"
     )
 
 
-def make_time_dims(path_glob):
+# Persistent cache of the per-file metadata scanned by `make_time_dims`, so
+# that reopening the same set of files only needs to `stat` them. Entries are
+# grouped by directory, and only the most recently updated directories are kept
+_TIME_INDEX_CACHE = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser()
+    / "sdf_xarray"
+    / "time_index.json"
+)
+_TIME_INDEX_VERSION = 1
+_TIME_INDEX_MAX_DIRECTORIES = 32
+
+
+def _load_time_index() -> dict[str, dict]:
+    """Read the time index cache as a mapping from directory to the entries
+    for the files in it. A missing or malformed cache is treated as empty"""
+    try:
+        with open(_TIME_INDEX_CACHE) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != _TIME_INDEX_VERSION:
+        return {}
+    directories = index.get("directories")
+    if not isinstance(directories, dict):
+        return {}
+    return {
+        directory: entries
+        for directory, entries in directories.items()
+        if isinstance(entries, dict)
+    }
+
+
+def _valid_time_index_entry(entry) -> bool:
+    return (
+        isinstance(entry, dict)
+        and type(entry.get("mtime_ns")) is int
+        and type(entry.get("size")) is int
+        and type(entry.get("time")) in (int, float)
+        and isinstance(entry.get("keys"), list)
+        and all(isinstance(key, str) for key in entry["keys"])
+    )
+
+
+def _save_time_index(directories: dict[str, dict]) -> None:
+    """Atomically write the time index cache. This is purely an
+    optimisation, so failing to write it is not an error"""
+    try:
+        _TIME_INDEX_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=_TIME_INDEX_CACHE.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {"version": _TIME_INDEX_VERSION, "directories": directories}, f
+                )
+            os.replace(tmp_name, _TIME_INDEX_CACHE)
+        finally:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+    except OSError:
+        pass
+
+
+def _update_time_index(time_index: dict[str, dict], new_entries: dict) -> None:
+    """Add the newly scanned files to the time index and save it, dropping
+    entries for files that no longer exist and the least recently updated
+    directories"""
+    by_directory = defaultdict(dict)
+    for f, entry in new_entries.items():
+        directory, name = os.path.split(f)
+        by_directory[directory][name] = entry
+
+    for directory, entries in by_directory.items():
+        old_entries = time_index.pop(directory, {})
+        time_index[directory] = {
+            name: entry
+            for name, entry in old_entries.items()
+            if _valid_time_index_entry(entry)
+            and os.path.exists(os.path.join(directory, name))
+        }
+        # Reinserting the directory moves it to the end, so the least
+        # recently updated directories are always first
+        time_index[directory].update(entries)
+
+    for directory in list(time_index)[:-_TIME_INDEX_MAX_DIRECTORIES]:
+        del time_index[directory]
+
+    _save_time_index(time_index)
+
+
+class _FileScan(NamedTuple):
+    time: float
+    keys: tuple[str, ...]
+
+
+@lru_cache(maxsize=4096)
+def _scan_one(path: str, mtime_ns: int, size: int) -> _FileScan:
+    """Read the time and the (renamed) variable and grid names from a
+    single SDF file, without reading any of the actual data.
+
+    ``mtime_ns`` and ``size`` are only used as part of the cache key, so
+    that we rescan the file if it changes
+    """
+    with SDFFile(path) as sdf_file:
+        return _scan_sdf_file(sdf_file)
+
+
+def _scan_sdf_file(sdf_file: SDFFile) -> _FileScan:
+    """Read the time and the (renamed) variable and grid names from an
+    open SDF file"""
+    rename = _rename_with_underscore
+    keys = [rename(key) for key in sdf_file.variables]
+    keys.extend(rename(grid.name) for grid in sdf_file.grids.values())
+    return _FileScan(sdf_file.header["time"], tuple(keys))
+
+
+def clear_header_cache(*, on_disk: bool = False) -> None:
+    """Forget the file headers cached by `make_time_dims`
+
+    Parameters
+    ----------
+    on_disk :
+        If ``True``, also remove the persistent index of file headers,
+        so that every file is opened again on the next scan
+    """
+    _scan_one.cache_clear()
+    if on_disk:
+        _TIME_INDEX_CACHE.unlink(missing_ok=True)
+
+
+# Below this many files, we open them serially
+_MIN_PARALLEL_SCAN = 8
+
+
+def _thread_map(func, *iterables, max_workers: int | None = None) -> list:
+    """Map ``func`` over the files in ``iterables`` in a thread pool. Opening
+    files is dominated by I/O latency, so the threads can overlap it, but
+    for only a few files it's not worth starting them"""
+    num_files = len(iterables[0])
+    if num_files < _MIN_PARALLEL_SCAN or max_workers == 1:
+        return list(map(func, *iterables))
+
+    if max_workers is None:
+        max_workers = min(32, num_files)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, *iterables))
+
+
+def make_time_dims(
+    path_glob, max_workers: int | None = None, persistent_cache: bool = False
+):
     """Extract the distinct set of time arrays from a collection of
     SDF files, along with a mapping from variable names to their time
     dimension.
+
+    Parameters
+    ----------
+    path_glob :
+        List of filenames
+    max_workers :
+        Maximum number of threads used to read the file headers. Defaults
+        to one per file, up to 32. Small numbers of files are always read
+        serially
+    persistent_cache :
+        If ``True``, also keep the file headers in an index under
+        ``$XDG_CACHE_HOME/sdf_xarray``, so that files which haven't changed
+        don't need to be opened again, even in a new session
     """
-    # Map variable names to list of times
-    vars_count = defaultdict(list)
-    for f in path_glob:
-        with SDFFile(str(f)) as sdf_file:
-            for key in sdf_file.variables:
-                vars_count[_rename_with_underscore(key)].append(sdf_file.header["time"])
-            for grid in sdf_file.grids.values():
-                vars_count[_rename_with_underscore(grid.name)].append(
-                    sdf_file.header["time"]
-                )
+    path_glob = [os.path.abspath(f) for f in path_glob]
+    stats = {f: os.stat(f) for f in path_glob}
+
+    # Only files that have changed since we last saw them need to be opened
+    results = {}
+    if persistent_cache:
+        time_index = _load_time_index()
+        for f in path_glob:
+            directory, name = os.path.split(f)
+            entry = time_index.get(directory, {}).get(name)
+            if (
+                _valid_time_index_entry(entry)
+                and entry["mtime_ns"] == stats[f].st_mtime_ns
+                and entry["size"] == stats[f].st_size
+            ):
+                results[f] = (entry["time"], entry["keys"])
+    missing = [f for f in path_glob if f not in results]
+
+    if missing:
+        scans = _thread_map(
+            _scan_one,
+            missing,
+            [stats[f].st_mtime_ns for f in missing],
+            [stats[f].st_size for f in missing],
+            max_workers=max_workers,
+        )
 
-    # Count the unique set of lists of times
-    times_count = Counter((tuple(v) for v in vars_count.values()))
-
-    # Give each set of times a unique name
-    time_dims = {}
-    count = 0
-    for t in times_count:
-        time_dims[f"time{count}"] = t
-        count += 1
-
-    # Map each variable to the name of its time dimension
-    var_times_map = {}
-    for key, value in vars_count.items():
-        v_tuple = tuple(value)
-        for time_name, time_dim in time_dims.items():
-            if v_tuple == time_dim:
-                var_times_map[key] = time_name
-                break
-        else:
-            raise ValueError(f"Didn't find time dim for {key!r} with {v_tuple}")
+        results.update(zip(missing, scans))
+
+        if persistent_cache:
+            new_entries = {
+                f: {
+                    "mtime_ns": stats[f].st_mtime_ns,
+                    "size": stats[f].st_size,
+                    "time": time,
+                    "keys": list(keys),
+                }
+                for f, (time, keys) in zip(missing, scans)
+            }
+            _update_time_index(time_index, new_entries)
+
+    return _group_time_dims(results[f] for f in path_glob)
+
+
+def _group_time_dims(scans: Iterable[tuple[float, list[str]]]):
+    """Work out the time dimensions from the time and variable names of
+    each file, in order"""
+    times = []
+    var_index: dict[str, int] = {}
+    rows = []
+    cols = []
+    for file_index, (time, keys) in enumerate(scans):
+        times.append(time)
+        for key in keys:
+            rows.append(var_index.setdefault(key, len(var_index)))
+            cols.append(file_index)
+
+    if not var_index:
+        return {}, {}
+
+    # Mark which files each variable appears in. Variables present in the
+    # same set of files share a time dimension, so we just need the unique
+    # rows of this matrix
+    present = np.zeros((len(var_index), len(times)), dtype=bool)
+    present[rows, cols] = True
+    unique_masks, first_index, inverse = np.unique(
+        present, axis=0, return_index=True, return_inverse=True
+    )
+    # `np.unique` sorts the rows, but we want to number the time dimensions in
+    # the order we first see them, so that the names are stable
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    unique_masks = unique_masks[order]
+    inverse = rank[inverse.ravel()]
+
+    times = np.asarray(times)
+    time_dims = {
+        f"time{n}": tuple(times[mask].tolist()) for n, mask in enumerate(unique_masks)
+    }
+    var_times_map = {key: f"time{inverse[index]}" for key, index in var_index.items()}
 
     return time_dims, var_times_map
 
@@ -249,68 +603,80 @@ class SDFDataStore(AbstractDataStore):
     def acquire_context(self, needs_lock=True):
         return self._manager.acquire_context(needs_lock)
 
+    def scan(self) -> _FileScan:
+        """The time and the names of all the variables and grids in the
+        file, including any that won't be loaded"""
+        return _scan_sdf_file(self.ds)
+
     def load(self):
-        # Drop any requested variables
-        if self.drop_variables:
-            for variable in self.drop_variables:
-                # TODO: nicer error handling
-                self.ds.variables.pop(variable)
+        # Acquiring the file goes through the file manager (and its lock), so
+        # only do it once
+        sdf_file = self.ds
+        grids = sdf_file.grids
+
+        # Variables to drop can be given by either their SDF or xarray names.
+        # Names that aren't in the file are ignored, as for other backends
+        drop_variables = set(self.drop_variables or ())
 
         # These two dicts are global metadata about the run or file
-        attrs = {**self.ds.header, **self.ds.run_info}
+        attrs = sdf_file.header.copy()
+        attrs.update(sdf_file.run_info)
 
         data_vars = {}
         coords = {}
 
-        def _norm_grid_name(grid_name: str) -> str:
-            """There may be multiple grids all with the same coordinate names, so
-            drop the "Grid/" from the start, and append the rest to the
-            dimension name. This lets us disambiguate them all. Probably"""
-            return grid_name.split("/", maxsplit=1)[-1]
-
-        def _grid_species_name(grid_name: str) -> str:
-            return grid_name.split("/")[-1]
-
-        def _process_grid_name(grid_name: str, transform_func) -> str:
-            """Apply the given transformation function and then rename with underscores."""
-            transformed_name = transform_func(grid_name)
-            renamed_name = _rename_with_underscore(transformed_name)
-            return renamed_name
+        # The processed names of each grid are needed both for the grid's own
+        # coordinates and for every variable defined on it, so only work them
+        # out once. Variables find their coordinates by looking up the
+        # dimension label and size in the grid's `dim_lookups` entry
+        grid_base_names = {}
+        dim_lookups = {}
+        for key, value in grids.items():
+            grid_base_names[key] = base_name = _rename_with_underscore(
+                _split_grid(value.name)[0]
+            )
+            dim_lookups[key] = {
+                (label, size): f"{label}_{base_name}"
+                for size, label in zip(value.shape, value.labels)
+            }
 
-        for key, value in self.ds.grids.items():
-            if "cpu" in key.lower():
-                # Had some problems with these variables, so just ignore them for now
+        for key, value in grids.items():
+            if _SKIP_GRID(key):
                 continue
 
             if not self.keep_particles and value.is_point_data:
                 continue
 
-            base_name = _process_grid_name(value.name, _norm_grid_name)
+            base_name = grid_base_names[key]
+            species_dim = (
+                f"ID_{_rename_with_underscore(_split_grid(key)[1])}"
+                if value.is_point_data
+                else None
+            )
 
+            # These attributes are the same for every coordinate on the grid
+            grid_attrs = {"point_data": value.is_point_data, "full_name": value.name}
             for label, coord, unit in zip(value.labels, value.data, value.units):
                 full_name = f"{label}_{base_name}"
-                dim_name = (
-                    f"ID_{_process_grid_name(key, _grid_species_name)}"
-                    if value.is_point_data
-                    else full_name
-                )
-                coords[full_name] = (
+                dim_name = species_dim or full_name
+                coords[full_name] = Variable(
                     dim_name,
                     coord,
-                    {
-                        "long_name": label.replace("_", " "),
-                        "units": unit,
-                        "point_data": value.is_point_data,
-                        "full_name": value.name,
-                    },
+                    {"long_name": label.replace("_", " "), "units": unit, **grid_attrs},
+                    fastpath=True,
                 )
 
+        # Cache of coordinate names for each pair of (grid, grid_mid)
+        dim_size_lookups = {}
+
         # Read and convert SDF variables and meshes to xarray DataArrays and Coordinates
-        for key, value in self.ds.variables.items():
-            # Had some problems with these variables, so just ignore them for now
-            if "cpu" in key.lower():
+        for key, value in sdf_file.variables.items():
+            if _SKIP_VARIABLE(key):
                 continue
-            if "output file" in key.lower():
+
+            if drop_variables and (
+                key in drop_variables or _rename_with_underscore(key) in drop_variables
+            ):
                 continue
 
             if not self.keep_particles and value.is_point_data:
@@ -321,8 +687,9 @@ class SDFDataStore(AbstractDataStore):
                 # scalar, or because it's an array over something
                 # else. We have no more information, so just make up
                 # some (hopefully) unique dimension names
-                shape = getattr(value.data, "shape", ())
-                dims = [f"dim_{key}_{n}" for n, _ in enumerate(shape)]
+                data = value.data
+                shape = getattr(data, "shape", ())
+                dims = [f"dim_{key}_{n}" for n in range(len(shape))]
                 base_name = _rename_with_underscore(key)
 
                 data_attrs = {}
@@ -331,41 +698,39 @@ class SDFDataStore(AbstractDataStore):
                 if value.units is not None:
                     data_attrs["units"] = value.units
 
-                data_vars[base_name] = Variable(dims, value.data, attrs=data_attrs)
+                data_vars[base_name] = Variable(
+                    dims, data, attrs=data_attrs, fastpath=True
+                )
                 continue
 
             if value.is_point_data:
                 # Point (particle) variables are 1D
-                var_coords = (f"ID_{_process_grid_name(key, _grid_species_name)}",)
+                var_coords = (f"ID_{_rename_with_underscore(_split_grid(key)[1])}",)
             else:
                 # These are DataArrays
 
                 # SDF makes matching up the coordinates a bit convoluted. Each
                 # dimension on a variable can be defined either on "grid" or
                 # "grid_mid", and the only way to tell which one is to compare the
-                # variable's dimension sizes for each grid. We do this by making a
-                # nested dict that looks something like:
+                # variable's dimension sizes for each grid. We do this by merging
+                # the lookups for both grids into a dict that looks something like:
                 #
-                #     {"X": {129: "X_Grid", 129: "X_Grid_mid"}}
+                #     {("X", 129): "X_Grid", ("X", 128): "X_Grid_mid"}
                 #
                 # Then we can look up the dimension label and size to get *our* name
-                # for the corresponding coordinate
-                dim_size_lookup = defaultdict(dict)
-                grid = self.ds.grids[value.grid]
-                grid_base_name = _process_grid_name(grid.name, _norm_grid_name)
-                for dim_size, dim_name in zip(grid.shape, grid.labels):
-                    dim_size_lookup[dim_name][dim_size] = f"{dim_name}_{grid_base_name}"
-
-                grid_mid = self.ds.grids[value.grid_mid]
-                grid_mid_base_name = _process_grid_name(grid_mid.name, _norm_grid_name)
-                for dim_size, dim_name in zip(grid_mid.shape, grid_mid.labels):
-                    dim_size_lookup[dim_name][
-                        dim_size
-                    ] = f"{dim_name}_{grid_mid_base_name}"
+                # for the corresponding coordinate. Most variables share the same
+                # few grids, so we only merge these once for each pair of grids
+                grid_pair = (value.grid, value.grid_mid)
+                dim_size_lookup = dim_size_lookups.get(grid_pair)
+                if dim_size_lookup is None:
+                    dim_size_lookup = dim_size_lookups[grid_pair] = {
+                        **dim_lookups[value.grid],
+                        **dim_lookups[value.grid_mid],
+                    }
 
                 var_coords = [
-                    dim_size_lookup[dim_name][dim_size]
-                    for dim_name, dim_size in zip(grid.labels, value.shape)
+                    dim_size_lookup[dim_name, dim_size]
+                    for dim_name, dim_size in zip(grids[value.grid].labels, value.shape)
                 ]
 
             # TODO: error handling here? other attributes?
@@ -378,7 +743,10 @@ class SDFDataStore(AbstractDataStore):
                 "long_name": long_name,
             }
             lazy_data = indexing.LazilyIndexedArray(SDFBackendArray(key, self))
-            data_vars[base_name] = Variable(var_coords, lazy_data, data_attrs)
+            # We already know the data is a valid lazy array, so skip the checks
+            data_vars[base_name] = Variable(
+                var_coords, lazy_data, data_attrs, fastpath=True
+            )
 
         # TODO: might need to decode if mult is set?
 
@@ -388,7 +756,7 @@ class SDFDataStore(AbstractDataStore):
         # )
 
         ds = xr.Dataset(data_vars, attrs=attrs, coords=coords)
-        ds.set_close(self.ds.close)
+        ds.set_close(self.close)
 
         return ds
 
@@ -404,31 +772,45 @@ class SDFEntrypoint(BackendEntrypoint):
         drop_variables=None,
         keep_particles=False,
     ):
-        if isinstance(filename_or_obj, pathlib.Path):
-            # sdf library takes a filename only
-            # TODO: work out if we need to deal with file handles
-            filename_or_obj = str(filename_or_obj)
-
-        store = SDFDataStore.open(
-            filename_or_obj,
-            drop_variables=drop_variables,
-            keep_particles=keep_particles,
-        )
+        if isinstance(filename_or_obj, SDFDataStore):
+            # Already opened, for example to read the header first
+            store = filename_or_obj
+        else:
+            if isinstance(filename_or_obj, pathlib.Path):
+                # sdf library takes a filename only
+                # TODO: work out if we need to deal with file handles
+                filename_or_obj = str(filename_or_obj)
+
+            store = SDFDataStore.open(
+                filename_or_obj,
+                drop_variables=drop_variables,
+                keep_particles=keep_particles,
+            )
         with close_on_error(store):
             return store.load()
 
     open_dataset_parameters = ["filename_or_obj", "drop_variables", "keep_particles"]
 
     def guess_can_open(self, filename_or_obj):
-        magic_number = try_read_magic_number_from_path(filename_or_obj)
-        if magic_number is not None:
-            return magic_number.startswith(b"SDF1")
-
+        # Checking the extension is much cheaper than reading the magic
+        # number, which matters when opening thousands of files
         try:
             _, ext = os.path.splitext(filename_or_obj)
         except TypeError:
+            ext = None
+        if ext in {".sdf", ".SDF"}:
+            return True
+
+        if not isinstance(filename_or_obj, (str, os.PathLike)):
+            return False
+
+        # `read1` makes at most one read call, rather than filling a whole
+        # buffer, which can be very slow on some network filesystems
+        try:
+            with open(filename_or_obj, "rb") as f:
+                return f.read1(8).startswith(b"SDF1")
+        except (OSError, TypeError):
             return False
-        return ext in {".sdf", ".SDF"}
 
     description = "Use .sdf files in Xarray"
 
@@ -440,27 +822,41 @@ class SDFPreprocess:
 
     def __init__(self):
         self.job_id: int | None = None
+        # Files from the same run mostly have the same coordinates, so
+        # remember which of them are particle coordinates
+        self._point_coords: dict[tuple[str, ...], list[str]] = {}
 
     def __call__(self, ds: xr.Dataset) -> xr.Dataset:
+        job_id = ds.attrs["jobid1"]
         if self.job_id is None:
-            self.job_id = ds.attrs["jobid1"]
+            self.job_id = job_id
 
-        if self.job_id != ds.attrs["jobid1"]:
+        if job_id != self.job_id:
             raise ValueError(
-                f"Mismatching job ids (got {ds.attrs['jobid1']}, expected {self.job_id})"
+                f"Mismatching job ids (got {job_id}, expected {self.job_id})"
             )
 
-        ds = ds.expand_dims(time=[ds.attrs["time"]])
+        time = ds.attrs["time"]
+        ds = ds.expand_dims(time=[time])
         ds = ds.assign_coords(
             time=(
                 "time",
-                [ds.attrs["time"]],
+                [time],
                 {"units": "s", "long_name": "Time", "full_name": "time"},
             )
         )
         # Particles' spartial coordinates also evolve in time
-        for coord, value in ds.coords.items():
-            if value.attrs.get("point_data", False):
-                ds.coords[coord] = value.expand_dims(time=[ds.attrs["time"]])
+        coord_names = tuple(ds.coords)
+        point_coords = self._point_coords.get(coord_names)
+        if point_coords is None:
+            point_coords = self._point_coords[coord_names] = [
+                coord
+                for coord, value in ds.coords.items()
+                if value.attrs.get("point_data", False)
+            ]
+        if not point_coords:
+            return ds
 
-        return ds
+        return ds.assign_coords(
+            {coord: ds.coords[coord].expand_dims(time=[time]) for coord in point_coords}
+        )
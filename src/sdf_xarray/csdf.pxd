@@ -2,7 +2,7 @@ cdef extern from "<stdint.h>" nogil:
     ctypedef signed int int32_t
     ctypedef signed long int64_t
 
-cdef extern from "sdf.h":
+cdef extern from "sdf.h" nogil:
     cdef enum:
         SDF_VERSION
         SDF_REVISION
@@ -118,10 +118,10 @@ cdef extern from "sdf.h":
                                        const int64_t *strides)
 
 
-cdef extern from "sdf_helper.h":
+cdef extern from "sdf_helper.h" nogil:
     bint sdf_helper_read_data(sdf_file_t *h, sdf_block_t *b)
 
 
-cdef extern from "stack_allocator.h":
+cdef extern from "stack_allocator.h" nogil:
     void sdf_stack_destroy(sdf_file_t *h)
     void sdf_stack_init(sdf_file_t *h)
@@ -12,8 +12,11 @@ if TYPE_CHECKING:
 
 def get_frame_title(data: xr.DataArray, frame: int, display_sdf_name: bool) -> str:
     """Generate the title for a frame"""
+    return _format_frame_title(data["time"][frame].to_numpy(), frame, display_sdf_name)
+
+
+def _format_frame_title(time: float, frame: int, display_sdf_name: bool) -> str:
     sdf_name = f", {frame:04d}.sdf" if display_sdf_name else ""
-    time = data["time"][frame].to_numpy()
     return f"t = {time:.2e}s{sdf_name}"
 
 
@@ -23,16 +26,19 @@ def calculate_window_velocity_and_edges(
     """Calculate the moving window's velocity and initial edges.
 
     1. Finds a lineout of the target atribute in the x coordinate of the first frame
-    2. Removes the NaN values to isolate the simulation window
+    2. Counts the non-NaN values to find the size of the simulation window
     3. Produces the index size of the window, indexed at zero
     4. Uses distance moved and final time of the simulation to calculate velocity and initial xlims
     """
     time_since_start = data["time"].values - data["time"].values[0]
     initial_window_edge = (0, 0)
-    target_lineout = data.values[0, :, 0]
-    target_lineout_window = target_lineout[~np.isnan(target_lineout)]
+    target_lineout = data[0, :, 0].values
     x_grid = data[x_axis_coord].values
-    window_size_index = target_lineout_window.size - 1
+    # Only the size of the window is needed, so count the NaNs rather than
+    # making a copy of the lineout without them
+    window_size_index = (
+        target_lineout.size - np.count_nonzero(np.isnan(target_lineout)) - 1
+    )
 
     velocity_window = (x_grid[-1] - x_grid[window_size_index]) / time_since_start[-1]
     initial_window_edge = (x_grid[0], x_grid[window_size_index])
@@ -40,12 +46,14 @@ def calculate_window_velocity_and_edges(
 
 
 def compute_global_limits(data: xr.DataArray) -> tuple[float, float]:
-    """Remove all NaN values from the target data to calculate the 1st and 99th percentiles,
+    """Calculate the 1st and 99th percentiles of the target data, ignoring NaN values,
     excluding extreme outliers.
     """
-    values_no_nan = data.values[~np.isnan(data.values)]
-    global_min = np.percentile(values_no_nan, 1)
-    global_max = np.percentile(values_no_nan, 99)
+    values = data.values
+    # `percentile` is much faster than `nanpercentile`, so only use the
+    # latter if there are actually NaNs to ignore
+    percentile = np.nanpercentile if np.isnan(values).any() else np.percentile
+    global_min, global_max = percentile(values, [1, 99])
     return global_min, global_max
 
 
@@ -97,6 +105,10 @@ def generate_animation(
     if ax is None:
         _, ax = plt.subplots()
 
+    # Every frame is needed, and the global limits already need all the
+    # data, so read it once up front rather than once per frame
+    data = data.compute()
+
     N_frames = data["time"].size
     global_min, global_max = compute_global_limits(data)
 
@@ -111,43 +123,64 @@ def generate_animation(
         plot = data.isel(time=0).plot(ax=ax, **kwargs)
         ax.set_title(get_frame_title(data, 0, display_sdf_name))
 
+        # The mesh is drawn with y as rows and x as columns
+        mesh_dims = (data[kwargs["y"]].dims[0], data[kwargs["x"]].dims[0])
+
         # Add colorbar
         long_name = data.attrs.get("long_name")
         units = data.attrs.get("units")
         plt.colorbar(plot, ax=ax, label=f"{long_name} [${units}$]")
 
-    # Initialise plo and set y-limits for 1D data
+    # Initialise plot and set the data limits for 1D data. The data is
+    # drawn along x if the coordinate has been put on the y axis
     if is_1d(data):
+        data_on_x = kwargs.get("y") in data.coords
         plot = data.isel(time=0).plot(ax=ax, **kwargs)
         ax.set_title(get_frame_title(data, 0, display_sdf_name))
-        ax.set_ylim(global_min, global_max)
+        if data_on_x:
+            ax.set_xlim(global_min, global_max)
+        else:
+            ax.set_ylim(global_min, global_max)
 
     if move_window:
         window_velocity, window_initial_edge, time_since_start = (
             calculate_window_velocity_and_edges(data, kwargs["x"])
         )
 
-    # User's choice for initial window edge supercides the one calculated
-    if "xlim" in kwargs:
-        window_initial_edge = kwargs["xlim"]
+        # User's choice for initial window edge supercides the one calculated
+        if "xlim" in kwargs:
+            window_initial_edge = kwargs["xlim"]
+
+        # The window moves at a constant velocity, so work out its edges for
+        # every frame in one go
+        window_shift = window_velocity * time_since_start
+        window_lower_edges = window_initial_edge[0] + window_shift
+        window_upper_edges = window_initial_edge[1] * 0.99 + window_shift
+
+    # Only the data changes between frames, so update the existing plot
+    # rather than clearing the axes and plotting from scratch. Work out how
+    # to do that once, rather than on every frame
+    if is_2d(data):
+        frames = data.transpose("time", *mesh_dims).values
+        set_frame_data = plot.set_array
+    else:
+        frames = data.transpose("time", ...).values
+        set_frame_data = plot[0].set_xdata if data_on_x else plot[0].set_ydata
+
+    # The titles only depend on the time, so make them all up front
+    titles = [
+        _format_frame_title(time, frame, display_sdf_name)
+        for frame, time in enumerate(data["time"].values)
+    ]
 
     def update(frame):
         # Set the xlim for each frame in the case of a moving window
         if move_window:
-            kwargs["xlim"] = (
-                window_initial_edge[0] + window_velocity * time_since_start[frame],
-                window_initial_edge[1] * 0.99
-                + window_velocity * time_since_start[frame],
-            )
-
-        # Update plot for the new frame
-        ax.clear()
-        data.isel(time=frame).plot(ax=ax, **kwargs)
-        ax.set_title(get_frame_title(data, frame, display_sdf_name))
-
-        # # Update y-limits for 1D data
-        if is_1d(data):
-            ax.set_ylim(global_min, global_max)
+            ax.set_xlim(window_lower_edges[frame], window_upper_edges[frame])
+
+        set_frame_data(frames[frame])
+        # The title was styled when it was first set, so only the text changes
+        ax.title.set_text(titles[frame])
 
     return FuncAnimation(
         ax.get_figure(),
@@ -2,6 +2,7 @@ cimport csdf
 
 import dataclasses
 import re
+import threading
 import time
 
 from libc.string cimport memcpy
@@ -159,21 +160,31 @@ cdef class SDFFile:
 
     """
     cdef csdf.sdf_file_t* _c_sdf_file
+    cdef object _lock
     cdef public str filename
     cdef public dict header, run_info
     cdef public dict[str, Variable] variables
     cdef public dict[str, Mesh] grids
 
     def __cinit__(self, filename: str):
-        self._c_sdf_file = csdf.sdf_open(
-            filename.encode("UTF-8"), 0, csdf.SDF_READ, False
-        )
+        cdef bytes encoded_filename = filename.encode("UTF-8")
+        cdef const char* c_filename = encoded_filename
+        cdef csdf.sdf_file_t* c_sdf_file
+
+        self._lock = threading.Lock()
+
+        # Reading the block list is most of the cost of opening a file, so
+        # release the GIL to let other threads open their files meanwhile
+        with nogil:
+            c_sdf_file = csdf.sdf_open(c_filename, 0, csdf.SDF_READ, False)
+            if c_sdf_file != NULL:
+                csdf.sdf_stack_init(c_sdf_file)
+                csdf.sdf_read_blocklist_all(c_sdf_file)
+
+        self._c_sdf_file = c_sdf_file
         if self._c_sdf_file == NULL:
             raise IOError(f"Failed to open SDF file '{filename}'")
 
-        csdf.sdf_stack_init(self._c_sdf_file)
-        csdf.sdf_read_blocklist_all(self._c_sdf_file)
-
         self.header = {
             "filename": filename,
             "file_version": self._c_sdf_file.file_version,
@@ -256,41 +267,48 @@ cdef class SDFFile:
         """Read a variable from the file, returning numpy array
         """
 
-        if self._c_sdf_file is NULL:
-            raise RuntimeError(
-                f"Can't read '{var.name}', file '{self.filename}' is closed"
-            )
-
         is_mesh: bool = isinstance(var, Mesh)
 
         # Has a parent block, so we need to average node data to midpoint
         if is_mesh and var.parent:
             return self._read_mid_grid(var)
 
-        cdef csdf.sdf_block_t* block = csdf.sdf_find_block_by_name(
-            self._c_sdf_file, var.name.encode("utf-8")
-        )
+        cdef csdf.sdf_block_t* block
 
-        if block is NULL:
-            raise RuntimeError(f"Could not read variable '{var.name}'")
+        # The SDF library keeps per-file state while reading, so reads from the
+        # same file mustn't overlap. The GIL is released while reading the data,
+        # so other threads can read from other files at the same time
+        with self._lock:
+            if self._c_sdf_file is NULL:
+                raise RuntimeError(
+                    f"Can't read '{var.name}', file '{self.filename}' is closed"
+                )
 
-        self._c_sdf_file.current_block = block
-        csdf.sdf_helper_read_data(self._c_sdf_file, block)
+            block = csdf.sdf_find_block_by_name(
+                self._c_sdf_file, var.name.encode("utf-8")
+            )
 
-        if is_mesh:
-            # Meshes store the data for separate dimensions in block.grids
-            if not (block.grids is not NULL and block.grids[0] is not NULL):
+            if block is NULL:
                 raise RuntimeError(f"Could not read variable '{var.name}'")
 
-            data = []
-            for i, dim in enumerate(var.shape):
-                data.append(
-                    self._make_array((dim,), var.dtype, block.grids[i])
-                )
-            return tuple(data)
+            self._c_sdf_file.current_block = block
+            with nogil:
+                csdf.sdf_helper_read_data(self._c_sdf_file, block)
+
+            if is_mesh:
+                # Meshes store the data for separate dimensions in block.grids
+                if not (block.grids is not NULL and block.grids[0] is not NULL):
+                    raise RuntimeError(f"Could not read variable '{var.name}'")
+
+                data = []
+                for i, dim in enumerate(var.shape):
+                    data.append(
+                        self._make_array((dim,), var.dtype, block.grids[i])
+                    )
+                return tuple(data)
 
-        # Normal variables
-        return self._make_array(var.shape, var.dtype, block.data)
+            # Normal variables
+            return self._make_array(var.shape, var.dtype, block.data)
 
     cdef _read_mid_grid(self, mesh: Mesh):
         """Read a midpoint grid"""
@@ -322,16 +340,20 @@ cdef class SDFFile:
         # isn't available from Cython. Might be able to use one of the other
         # low-level creation routines?
         var_array = np.empty(dims, dtype=dtype, order="F")
-        memcpy(cnp.PyArray_DATA(var_array), data, var_array.nbytes)
+        cdef void* var_data = cnp.PyArray_DATA(var_array)
+        cdef size_t nbytes = var_array.nbytes
+        with nogil:
+            memcpy(var_data, data, nbytes)
 
         return var_array
 
     def close(self):
-        if self._c_sdf_file is NULL:
-            return
-        csdf.sdf_stack_destroy(self._c_sdf_file)
-        csdf.sdf_close(self._c_sdf_file)
-        self._c_sdf_file = NULL
+        with self._lock:
+            if self._c_sdf_file is NULL:
+                return
+            csdf.sdf_stack_destroy(self._c_sdf_file)
+            csdf.sdf_close(self._c_sdf_file)
+            self._c_sdf_file = NULL
 
     def __enter__(self):
         return self
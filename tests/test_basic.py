@@ -1,9 +1,23 @@
+import collections
 import pathlib
+import warnings
 
 import pytest
 import xarray as xr
 
-from sdf_xarray import SDFPreprocess, _process_latex_name, open_mfdataset
+import sdf_xarray
+from sdf_xarray import (
+    SDFEntrypoint,
+    SDFFile,
+    SDFPreprocess,
+    _natural_sort_key,
+    _process_latex_name,
+    _scan_one,
+    clear_header_cache,
+    make_time_dims,
+    open_mfdataset,
+    open_sdf,
+)
 
 EXAMPLE_FILES_DIR = pathlib.Path(__file__).parent / "example_files"
 EXAMPLE_MISMATCHED_FILES_DIR = (
@@ -26,6 +40,31 @@ def test_basic():
         assert x_coord not in df.coords
 
 
+def test_open_sdf():
+    filename = EXAMPLE_FILES_DIR / "0010.sdf"
+    with (
+        open_sdf(filename, keep_particles=True) as df,
+        xr.open_dataset(filename, keep_particles=True) as expected,
+    ):
+        xr.testing.assert_identical(df, expected)
+        assert df.encoding["source"] == expected.encoding["source"]
+
+
+def test_guess_can_open(tmp_path):
+    entrypoint = SDFEntrypoint()
+    assert entrypoint.guess_can_open(EXAMPLE_FILES_DIR / "0000.sdf")
+
+    renamed = tmp_path / "0000.dat"
+    renamed.write_bytes((EXAMPLE_FILES_DIR / "0000.sdf").read_bytes())
+    assert entrypoint.guess_can_open(renamed)
+
+    not_sdf = tmp_path / "not_sdf.dat"
+    not_sdf.write_bytes(b"CDF\x01")
+    assert not entrypoint.guess_can_open(not_sdf)
+    assert not entrypoint.guess_can_open(tmp_path / "missing.dat")
+    assert not entrypoint.guess_can_open(tmp_path)
+
+
 def test_constant_name_and_units():
     with xr.open_dataset(EXAMPLE_FILES_DIR / "0000.sdf") as df:
         name = "Absorption_Total_Laser_Energy_Injected"
@@ -35,6 +74,16 @@ def test_constant_name_and_units():
         assert df[name].attrs["full_name"] == full_name
 
 
+def test_drop_variables():
+    with xr.open_dataset(
+        EXAMPLE_FILES_DIR / "0000.sdf",
+        drop_variables=["Electric_Field_Ex", "Electric Field/Ey", "not_a_variable"],
+    ) as df:
+        assert "Electric_Field_Ex" not in df
+        assert "Electric_Field_Ey" not in df
+        assert "Absorption_Total_Laser_Energy_Injected" in df
+
+
 def test_coords():
     with xr.open_dataset(EXAMPLE_FILES_DIR / "0010.sdf") as df:
         px_electron = "dist_fn_x_px_electron"
@@ -83,6 +132,11 @@ def test_multiple_files_one_time_dim():
     assert absorption.shape == (11,)
 
 
+def test_multiple_files_string_glob():
+    df = open_mfdataset(str(EXAMPLE_FILES_DIR / "*.sdf"))
+    assert df["Electric_Field_Ex"].shape == (11, 16)
+
+
 def test_multiple_files_multiple_time_dims():
     df = open_mfdataset(
         EXAMPLE_FILES_DIR.glob("*.sdf"), separate_times=True, keep_particles=True
@@ -96,6 +150,130 @@ def test_multiple_files_multiple_time_dims():
     assert df["Absorption_Total_Laser_Energy_Injected"].shape == (11,)
 
 
+def test_multiple_files_multiple_time_dims_parallel_chunks():
+    df = open_mfdataset(
+        EXAMPLE_FILES_DIR.glob("*.sdf"), separate_times=True, parallel=True, chunks={}
+    )
+    assert df["Electric_Field_Ex"].chunks is not None
+    assert df["Electric_Field_Ex"].shape == (11, 16)
+    assert df["Electric_Field_Ez"].shape == (1, 16)
+
+
+def test_chunks_smaller_than_variable():
+    # SDF files aren't chunked on disk, so any chunking is fine
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message=".*separate the stored chunks")
+        with xr.open_dataset(
+            EXAMPLE_FILES_DIR / "0000.sdf", chunks={"X_Grid_mid": 4}
+        ) as df:
+            assert df["Electric_Field_Ex"].chunks == ((4, 4, 4, 4),)
+
+
+def test_multiple_files_multiple_time_dims_without_particles():
+    files = sorted(EXAMPLE_FILES_DIR.glob("*.sdf"))
+    _, var_times_map = make_time_dims(files)
+
+    # Skipping the particles shouldn't change the names of the time dimensions
+    df = open_mfdataset(files, separate_times=True)
+    for name, var in df.data_vars.items():
+        assert var.dims[0] == var_times_map[name]
+
+
+def test_multiple_files_multiple_time_dims_max_workers():
+    files = sorted(EXAMPLE_FILES_DIR.glob("*.sdf"))
+    expected = open_mfdataset(files, separate_times=True)
+    for max_workers in [1, 3]:
+        df = open_mfdataset(files, separate_times=True, max_workers=max_workers)
+        xr.testing.assert_identical(df, expected)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_multiple_files_multiple_time_dims_opens_once(monkeypatch, parallel):
+    opened = collections.Counter()
+
+    def counting_sdf_file(filename):
+        opened[filename] += 1
+        return SDFFile(filename)
+
+    monkeypatch.setattr(sdf_xarray, "SDFFile", counting_sdf_file)
+    clear_header_cache()
+    files = sorted(EXAMPLE_FILES_DIR.glob("*.sdf"))
+    open_mfdataset(files, separate_times=True, parallel=parallel)
+    assert opened == {str(f): 1 for f in files}
+
+
+def test_make_time_dims(tmp_path, monkeypatch):
+    index_path = tmp_path / "time_index.json"
+    monkeypatch.setattr(sdf_xarray, "_TIME_INDEX_CACHE", index_path)
+
+    time_dims, var_times_map = make_time_dims(sorted(EXAMPLE_FILES_DIR.glob("*.sdf")))
+    # The on-disk index is opt-in
+    assert not index_path.exists()
+    assert len(time_dims) == 3
+    assert len(time_dims[var_times_map["Electric_Field_Ex"]]) == 11
+    assert len(time_dims[var_times_map["Electric_Field_Ez"]]) == 1
+    assert len(time_dims[var_times_map["Particles_Weight_proton"]]) == 2
+    assert var_times_map["Electric_Field_Ex"] == var_times_map["Grid_Grid"]
+
+
+def test_clear_header_cache(tmp_path, monkeypatch):
+    index_path = tmp_path / "time_index.json"
+    monkeypatch.setattr(sdf_xarray, "_TIME_INDEX_CACHE", index_path)
+
+    make_time_dims(EXAMPLE_FILES_DIR.glob("*.sdf"), persistent_cache=True)
+    assert index_path.exists()
+    assert _scan_one.cache_info().currsize > 0
+
+    clear_header_cache()
+    assert _scan_one.cache_info().currsize == 0
+    assert index_path.exists()
+
+    clear_header_cache(on_disk=True)
+    assert not index_path.exists()
+    # Nothing to remove is fine
+    clear_header_cache(on_disk=True)
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        "[1, 2, 3]",
+        '{"version": 1, "directories": []}',
+        '{"version": 1, "directories": {"%s": {"0000.sdf": {"mtime_ns": "x"}}}}',
+        '{"version": 1, "directories": {"%s": {"0000.sdf": null}}}',
+    ],
+)
+def test_persistent_cache_malformed(tmp_path, monkeypatch, index):
+    index_path = tmp_path / "time_index.json"
+    monkeypatch.setattr(sdf_xarray, "_TIME_INDEX_CACHE", index_path)
+    index_path.write_text(index.replace("%s", str(EXAMPLE_FILES_DIR.absolute())))
+    clear_header_cache()
+
+    files = sorted(EXAMPLE_FILES_DIR.glob("*.sdf"))
+    expected = make_time_dims(files)
+    assert make_time_dims(files, persistent_cache=True) == expected
+
+    # The malformed index should have been replaced with a valid one
+    clear_header_cache()
+    assert make_time_dims(files, persistent_cache=True) == expected
+    assert _scan_one.cache_info().currsize == 0
+
+
+def test_natural_sort_key():
+    files = ["run/10000.sdf", "run/9999.sdf", "run/0001.sdf", "restart/0002.sdf"]
+    assert sorted(files, key=_natural_sort_key) == [
+        "restart/0002.sdf",
+        "run/0001.sdf",
+        "run/9999.sdf",
+        "run/10000.sdf",
+    ]
+    # Characters like superscripts pass ``str.isdigit`` but can't go through ``int``
+    assert sorted(["x1²/10.sdf", "x1²/9.sdf"], key=_natural_sort_key) == [
+        "x1²/9.sdf",
+        "x1²/10.sdf",
+    ]
+
+
 def test_erroring_on_mismatched_jobid_files():
     with pytest.raises(ValueError):
         xr.open_mfdataset(
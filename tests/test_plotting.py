@@ -0,0 +1,125 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+import xarray as xr
+
+import sdf_xarray  # noqa: F401
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+plt = pytest.importorskip("matplotlib.pyplot")
+
+TIMES = np.array([0.0, 1.0e-15, 2.0e-15, 3.0e-15])
+ATTRS = {"long_name": "Electric Field $E_y$", "units": "V/m"}
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+def make_1d_data():
+    x = np.linspace(0, 1, 20)
+    values = np.sin(np.outer(np.arange(1, TIMES.size + 1), x))
+    return xr.DataArray(
+        values,
+        dims=("time", "X_Grid_mid"),
+        coords={"time": TIMES, "X_Grid_mid": x},
+        attrs=ATTRS,
+    )
+
+
+def make_2d_data(window_size=None):
+    x = np.linspace(0, 3, 30)
+    y = np.linspace(0, 1, 10)
+    rng = np.random.default_rng(42)
+    values = rng.random((TIMES.size, x.size, y.size))
+    if window_size is not None:
+        # Only the first part of the x grid is filled in at the start
+        values[0, window_size:, :] = np.nan
+    return xr.DataArray(
+        values,
+        dims=("time", "X_Grid_mid", "Y_Grid_mid"),
+        coords={"time": TIMES, "X_Grid_mid": x, "Y_Grid_mid": y},
+        attrs=ATTRS,
+    )
+
+
+def render(ani, tmp_path, snapshot):
+    """Render every frame of the animation, returning the result of
+    calling ``snapshot`` after each one is drawn"""
+    snapshots = []
+    ani.save(
+        tmp_path / "animation.gif",
+        writer="pillow",
+        progress_callback=lambda frame, total: snapshots.append(snapshot()),
+    )
+    return snapshots
+
+
+def test_animate_1d(tmp_path):
+    data = make_1d_data()
+    _, ax = plt.subplots()
+    ani = data.epoch.animate(ax=ax)
+    (line,) = ax.get_lines()
+
+    frames = render(ani, tmp_path, lambda: (ax.get_title(), line.get_ydata().copy()))
+    assert len(frames) == TIMES.size
+    for (title, ydata), time, values in zip(frames, TIMES, data.values):
+        assert title == f"t = {time:.2e}s"
+        npt.assert_array_equal(ydata, values)
+
+
+def test_animate_1d_coordinate_on_y(tmp_path):
+    data = make_1d_data()
+    _, ax = plt.subplots()
+    ani = data.epoch.animate(ax=ax, y="X_Grid_mid")
+    (line,) = ax.get_lines()
+
+    frames = render(
+        ani, tmp_path, lambda: (line.get_xdata().copy(), line.get_ydata().copy())
+    )
+    for (xdata, ydata), values in zip(frames, data.values):
+        npt.assert_array_equal(xdata, values)
+        npt.assert_array_equal(ydata, data["X_Grid_mid"].values)
+
+
+def test_animate_2d(tmp_path):
+    data = make_2d_data()
+    _, ax = plt.subplots()
+    ani = data.epoch.animate(ax=ax, display_sdf_name=True)
+    (mesh,) = ax.collections
+
+    frames = render(ani, tmp_path, lambda: (ax.get_title(), mesh.get_array().copy()))
+    assert len(frames) == TIMES.size
+    for frame, (title, mesh_data) in enumerate(frames):
+        assert title == f"t = {TIMES[frame]:.2e}s, {frame:04d}.sdf"
+        # The mesh has y as rows and x as columns
+        npt.assert_array_equal(mesh_data, data.values[frame].T)
+
+
+def test_animate_2d_swapped_axes(tmp_path):
+    data = make_2d_data()
+    _, ax = plt.subplots()
+    ani = data.epoch.animate(ax=ax, x="Y_Grid_mid", y="X_Grid_mid")
+    (mesh,) = ax.collections
+
+    frames = render(ani, tmp_path, lambda: mesh.get_array().copy())
+    for mesh_data, values in zip(frames, data.values):
+        npt.assert_array_equal(mesh_data, values)
+
+
+def test_animate_moving_window(tmp_path):
+    data = make_2d_data(window_size=10)
+    _, ax = plt.subplots()
+    ani = data.epoch.animate(ax=ax, move_window=True)
+
+    xlims = render(ani, tmp_path, ax.get_xlim)
+    assert len(xlims) == TIMES.size
+
+    x = data["X_Grid_mid"].values
+    npt.assert_allclose(xlims[0], (x[0], x[9] * 0.99))
+    # The window moves along at a constant velocity
+    distance = x[-1] - x[9]
+    npt.assert_allclose(np.diff(xlims, axis=0), distance / (TIMES.size - 1))